@@ -1,27 +1,27 @@
-
-import gradio as gr
 import os
 import sys
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
 # Ensure backend directory is in path so we can import main
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from main import app as fastapi_app
-except ImportError:
-    # Fallback if running from a different context
-    from backend.main import app as fastapi_app
-
-# Create a Gradio interface
-with gr.Blocks() as demo:
-    gr.Markdown("# ForensicFlow Backend Tunnel")
-    gr.Markdown("The backend is running. Use the public URL below for API calls.")
-    gr.Markdown("This interface confirms the tunnel is active.")
 
 def start_tunnel():
+    # Heavy imports live here so that importing this module stays cheap;
+    # gradio alone adds hundreds of ms and tens of MB at import time.
+    import gradio as gr
+
+    try:
+        from main import app as fastapi_app
+    except ImportError:
+        # Fallback if running from a different context
+        from backend.main import app as fastapi_app
+
+    # Create a Gradio interface
+    with gr.Blocks() as demo:
+        gr.Markdown("# ForensicFlow Backend Tunnel")
+        gr.Markdown("The backend is running. Use the public URL below for API calls.")
+        gr.Markdown("This interface confirms the tunnel is active.")
+
     print("Starting Gradio Tunnel...")
     
     # Launch Gradio interface with public tunnel
@@ -10,103 +10,190 @@ Implements:
 3. Layered Shell Networks (Low-degree intermediary chains)
 4. Suspicion Scoring System
 
-Optimized for datasets up to 10K+ transactions.
+Optimized for datasets up to 10K+ transactions. The graph is held as flat
+CSR arrays over interned node ids (see build_graph), and the engine stays
+standard-library only so it deploys to serverless runtimes (Vercel) without
+compiled extensions.
 """
 
 import time
 import math
 import csv
+import heapq
 import io
-from collections import defaultdict, deque
+from array import array
+from collections import Counter, deque
 from datetime import datetime
-from typing import Any
+from itertools import accumulate, chain, filterfalse, repeat
+from operator import add, itemgetter
+from typing import Any, Sequence
 
 
 # ==============================================
 # DATA STRUCTURES
 # ==============================================
 
-def build_graph(transactions: list[dict]) -> dict:
-    """Build adjacency list graph from parsed transactions.
-    Pre-computes epoch timestamps to avoid repeated datetime conversions.
-    """
-    adjacency: dict[str, list] = defaultdict(list)
-    reverse_adj: dict[str, list] = defaultdict(list)
-    nodes: set[str] = set()
-    node_stats: dict[str, dict] = {}
-
-    # Pre-compile date formats
-    DATE_FORMATS = (
-        "%Y-%m-%d %H:%M:%S",
-        "%d-%m-%Y %H:%M",
-        "%d-%m-%Y %H:%M:%S",
-        "%m-%d-%Y %H:%M",
-        "%Y/%m/%d %H:%M:%S",
-        "%d/%m/%Y %H:%M",
-    )
-
-    for tx in transactions:
-        sender = tx["sender_id"]
-        receiver = tx["receiver_id"]
-        amount = float(tx["amount"])
-
-        try:
-            ts_str = tx["timestamp"].strip()
-            ts = None
-            for fmt in DATE_FORMATS:
-                try:
-                    ts = datetime.strptime(ts_str, fmt)
-                    break
-                except ValueError:
-                    continue
-            if ts is None:
-                raise ValueError(f"Unknown date format: {ts_str}")
-            epoch = ts.timestamp()
-        except Exception as e:
-            print(f"Skipping bad transaction {tx.get('transaction_id')}: {e}")
-            continue
-
-        tx_id = tx["transaction_id"]
-
-        nodes.add(sender)
-        nodes.add(receiver)
+# Transaction column layout produced by parse_csv_content
+TX_COLUMNS = ("transaction_id", "sender_id", "receiver_id", "amount", "timestamp")
 
-        adjacency[sender].append({
-            "receiver": receiver,
-            "amount": amount,
-            "epoch": epoch,
-            "txId": tx_id,
-        })
+# Accepted timestamp formats, in order of precedence
+DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%m-%d-%Y %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+)
 
-        reverse_adj[receiver].append({
-            "sender": sender,
-            "amount": amount,
-            "epoch": epoch,
-            "txId": tx_id,
-        })
 
-        for account_id in (sender, receiver):
-            if account_id not in node_stats:
-                node_stats[account_id] = {
-                    "inDeg": 0, "outDeg": 0,
-                    "totalIn": 0.0, "totalOut": 0.0,
-                    "txCount": 0, "epochs": [],
-                }
+def _parse_epochs(timestamps: Sequence[str]) -> list[float | None]:
+    """Parse a column of timestamp strings into epoch seconds.
 
-        node_stats[sender]["outDeg"] += 1
-        node_stats[sender]["totalOut"] += amount
-        node_stats[sender]["txCount"] += 1
-        node_stats[sender]["epochs"].append(epoch)
+    Each distinct string is parsed once. Formats are applied as successive
+    passes over the strings still unresolved, so the first matching format
+    in DATE_FORMATS wins. Canonical "YYYY-MM-DD HH:MM:SS" values go through
+    fromisoformat. Unparseable values map to None.
+    """
+    resolved: dict[str, float] = {}
+    pending: list[tuple[str, str]] = []
+    for raw in set(timestamps):
+        if not isinstance(raw, str):
+            continue
+        ts_str = raw.strip()
+        if (len(ts_str) == 19 and ts_str[4] == "-" and ts_str[7] == "-"
+                and ts_str[10] == " " and ts_str[13] == ":" and ts_str[16] == ":"):
+            try:
+                resolved[raw] = datetime.fromisoformat(ts_str).timestamp()
+                continue
+            except ValueError:
+                pass
+        pending.append((raw, ts_str))
 
-        node_stats[receiver]["inDeg"] += 1
-        node_stats[receiver]["totalIn"] += amount
-        node_stats[receiver]["txCount"] += 1
-        node_stats[receiver]["epochs"].append(epoch)
+    for fmt in DATE_FORMATS:
+        if not pending:
+            break
+        unresolved = []
+        for raw, ts_str in pending:
+            try:
+                resolved[raw] = datetime.strptime(ts_str, fmt).timestamp()
+            except (ValueError, OverflowError, OSError):
+                unresolved.append((raw, ts_str))
+        pending = unresolved
+
+    return [resolved.get(raw) for raw in timestamps]
+
+
+def build_graph(transactions: tuple[tuple[str, ...], ...]) -> dict:
+    """Build a CSR (compressed sparse row) graph from parsed transactions.
+
+    Account IDs are interned to contiguous ints in first-seen order. Edges are
+    stored as parallel arrays grouped by sender: the out-edges of node v live
+    at positions indptr[v]:indptr[v+1] of neighbors/amounts, in input order.
+    The same layout grouped by receiver is kept in the rev* arrays.
+    outTimeline/inTimeline share indptr/revIndptr but hold each node's
+    epochs sorted ascending, so they do not line up with neighbors/amounts.
+    senderOrder lists the ids with out-edges in first-as-sender order.
+    Pre-computes epoch timestamps to avoid repeated datetime conversions.
+    Takes the columns in TX_COLUMNS order (see parse_csv_content).
+    """
+    tx_id_col, sender_col, receiver_col, amount_col, timestamp_col = (
+        transactions or ((),) * len(TX_COLUMNS)
+    )
+    row_epochs = _parse_epochs(timestamp_col)
+    try:
+        row_amounts = array("d", map(float, amount_col))
+    except ValueError:
+        row_amounts = None
+
+    if row_amounts is None or None in row_epochs:
+        keep = []
+        kept_amounts = array("d")
+        for k, epoch in enumerate(row_epochs):
+            try:
+                amount = float(amount_col[k])
+            except ValueError as e:
+                print(f"Skipping bad transaction {tx_id_col[k]}: {e}")
+                continue
+            if epoch is None:
+                print(f"Skipping bad transaction {tx_id_col[k]}: "
+                      f"Unknown date format: {timestamp_col[k]}")
+                continue
+            keep.append(k)
+            kept_amounts.append(amount)
+        sender_col = [sender_col[k] for k in keep]
+        receiver_col = [receiver_col[k] for k in keep]
+        row_epochs = [row_epochs[k] for k in keep]
+        row_amounts = kept_amounts
+
+    # Interning walks sender, receiver, sender, ... so ids stay first-seen
+    endpoints = list(chain.from_iterable(zip(sender_col, receiver_col)))
+    node_index: dict[str, int] = {acct: i for i, acct in enumerate(dict.fromkeys(endpoints))}
+    codes = list(map(node_index.__getitem__, endpoints))
+    senders, receivers = codes[0::2], codes[1::2]
+    n = len(node_index)
+    m = len(senders)
+
+    out_count, in_count = Counter(senders), Counter(receivers)
+    out_deg = array("l", map(out_count.get, range(n), repeat(0)))
+    in_deg = array("l", map(in_count.get, range(n), repeat(0)))
+
+    indptr = list(accumulate(out_deg, initial=0))
+    rev_indptr = list(accumulate(in_deg, initial=0))
+
+    # Counting-sort placement: the transaction order is preserved per slice
+    neighbors = [0] * m
+    amounts = array("d", [0.0]) * m
+    out_timeline = array("d", [0.0]) * m
+    rev_neighbors = [0] * m
+    rev_amounts = array("d", [0.0]) * m
+    in_timeline = array("d", [0.0]) * m
+
+    out_cursor = indptr[:-1]
+    in_cursor = rev_indptr[:-1]
+    for k in range(m):
+        s = senders[k]
+        r = receivers[k]
+
+        pos = out_cursor[s]
+        out_cursor[s] = pos + 1
+        neighbors[pos] = r
+        amounts[pos] = row_amounts[k]
+        out_timeline[pos] = row_epochs[k]
+
+        pos = in_cursor[r]
+        in_cursor[r] = pos + 1
+        rev_neighbors[pos] = s
+        rev_amounts[pos] = row_amounts[k]
+        in_timeline[pos] = row_epochs[k]
+
+    for ptr, timeline in ((indptr, out_timeline), (rev_indptr, in_timeline)):
+        for v in range(n):
+            lo, hi = ptr[v], ptr[v + 1]
+            if hi - lo > 1:
+                timeline[lo:hi] = array("d", sorted(timeline[lo:hi]))
+
+    # Per-node stats as parallel arrays indexed by node id
+    node_stats = {
+        "inDeg": in_deg,
+        "outDeg": out_deg,
+        "totalIn": array("d", [sum(rev_amounts[rev_indptr[v]:rev_indptr[v + 1]], 0.0) for v in range(n)]),
+        "totalOut": array("d", [sum(amounts[indptr[v]:indptr[v + 1]], 0.0) for v in range(n)]),
+        "txCount": array("l", map(add, in_deg, out_deg)),
+    }
 
     return {
-        "adjacency": dict(adjacency),
-        "reverseAdj": dict(reverse_adj),
-        "nodes": list(nodes),
+        "nodes": list(node_index),
+        "nodeIndex": node_index,
+        "indptr": indptr,
+        "neighbors": neighbors,
+        "amounts": amounts,
+        "outTimeline": out_timeline,
+        "revIndptr": rev_indptr,
+        "revNeighbors": rev_neighbors,
+        "revAmounts": rev_amounts,
+        "inTimeline": in_timeline,
+        "senderOrder": list(dict.fromkeys(senders)),
         "nodeStats": node_stats,
     }
 
@@ -116,121 +203,233 @@ def build_graph(transactions: list[dict]) -> dict:
 # Optimized with SCC pre-filtering and early termination
 # ==============================================
 
-def _find_sccs(adjacency: dict, node_list: list[str]) -> list[set[str]]:
-    """Tarjan's SCC algorithm — only cycles can exist within SCCs."""
-    index_counter = [0]
-    stack = []
-    on_stack = set()
-    index = {}
-    lowlink = {}
+def _find_sccs(indptr: list[int], neighbors: list[int], node_list: list[int]) -> list[set[int]]:
+    """Tarjan's SCC algorithm — only cycles can exist within SCCs.
+
+    Iterative form: an explicit work stack of (node, edge iterator) frames
+    replaces recursion, so deep chains cannot hit the recursion limit and
+    each arc is examined exactly once. Per-node state lives in flat arrays
+    indexed by node id (index -1 = not yet visited) rather than dicts/sets.
+    """
+    n = len(indptr) - 1
+    index_counter = 0
+    open_stack = []
+    on_stack = bytearray(n)
+    index = [-1] * n
+    lowlink = [0] * n
     sccs = []
 
-    def strongconnect(v):
-        index[v] = lowlink[v] = index_counter[0]
-        index_counter[0] += 1
-        stack.append(v)
-        on_stack.add(v)
-
-        for edge in adjacency.get(v, []):
-            w = edge["receiver"]
-            if w not in index:
-                strongconnect(w)
-                lowlink[v] = min(lowlink[v], lowlink[w])
-            elif w in on_stack:
-                lowlink[v] = min(lowlink[v], index[w])
-
-        if lowlink[v] == index[v]:
-            scc = set()
-            while True:
-                w = stack.pop()
-                on_stack.discard(w)
-                scc.add(w)
-                if w == v:
+    for root in node_list:
+        if index[root] >= 0:
+            continue
+
+        index[root] = lowlink[root] = index_counter
+        index_counter += 1
+        open_stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(neighbors[indptr[root]:indptr[root + 1]]))]
+
+        while work:
+            v, succ = work[-1]
+            descended = False
+            for w in succ:
+                if index[w] < 0:
+                    index[w] = lowlink[w] = index_counter
+                    index_counter += 1
+                    open_stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, iter(neighbors[indptr[w]:indptr[w + 1]])))
+                    descended = True
                     break
-            if len(scc) >= 3:  # Only SCCs with 3+ nodes can have length-3+ cycles
-                sccs.append(scc)
+                if on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+            if descended:
+                continue
 
-    # Use iterative approach for large graphs to avoid stack overflow
-    for v in node_list:
-        if v not in index:
-            strongconnect(v)
+            # All arcs of v explored — pop its frame and propagate lowlink
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[v] < lowlink[parent]:
+                    lowlink[parent] = lowlink[v]
+
+            if lowlink[v] == index[v]:
+                scc = set()
+                while True:
+                    w = open_stack.pop()
+                    on_stack[w] = 0
+                    scc.add(w)
+                    if w == v:
+                        break
+                if len(scc) >= 3:  # Only SCCs with 3+ nodes can have length-3+ cycles
+                    sccs.append(scc)
 
     return sccs
 
 
-def detect_cycles(adjacency: dict, node_list: list[str], node_stats: dict) -> list[list[str]]:
-    """Detect cycles of length 3-5 using DFS with SCC pruning."""
-    cycles: list[list[str]] = []
-    seen: set[str] = set()
+def detect_cycles(graph: dict) -> list[list[int]]:
+    """Detect cycles of length 3-5 using DFS with SCC pruning.
+
+    Like the other detectors, returns node ids; account id strings are only
+    attached by calculate_suspicion_scores.
+    """
+    indptr = graph["indptr"]
+    neighbors = graph["neighbors"]
+    in_deg = graph["nodeStats"]["inDeg"]
+    out_deg = graph["nodeStats"]["outDeg"]
+    cycles: list[list[int]] = []
+    seen: set[tuple[int, ...]] = set()
     start_time = time.perf_counter()
     MAX_TIME_S = 4.0
     MAX_CYCLES = 200
+    MAX_HOPS_BACK = 4  # from a cycle's 2nd node back to start, at length 5
 
     # Pre-filter: only consider nodes with both in > 0 and out > 0
     candidates = [
-        n for n in node_list
-        if node_stats[n]["inDeg"] > 0 and node_stats[n]["outDeg"] > 0
+        v for v, (d_in, d_out) in enumerate(zip(in_deg, out_deg))
+        if d_in > 0 and d_out > 0
     ]
 
     # Find SCCs — cycles only exist within SCCs
-    sccs = _find_sccs(adjacency, candidates)
-    scc_nodes = set()
-    for scc in sccs:
-        scc_nodes.update(scc)
+    sccs = _find_sccs(indptr, neighbors, candidates)
+    # Component label per node (0 = in no SCC of size 3+). The DFS only
+    # follows edges inside the start node's own component, since an edge
+    # that leaves it can never lead back
+    n = len(in_deg)
+    scc_of = [0] * n
+    for label, scc in enumerate(sccs, 1):
+        for v in scc:
+            scc_of[v] = label
 
     # Only search for cycles within SCC nodes
-    scc_candidates = [n for n in candidates if n in scc_nodes]
+    scc_candidates = [v for v in candidates if scc_of[v]]
 
     # Sort by degree (higher degree first) for faster discovery
     scc_candidates.sort(
-        key=lambda n: node_stats[n]["inDeg"] + node_stats[n]["outDeg"],
+        key=lambda v: in_deg[v] + out_deg[v],
         reverse=True,
     )
 
+    deadline = start_time + MAX_TIME_S
+    remaining = [MAX_CYCLES]
+    path = [0] * 5
+    rev_indptr, rev_neighbors = graph["revIndptr"], graph["revNeighbors"]
+    # Shared by every start; both are restored after each search
+    visited = bytearray(n)
+    dist = [MAX_HOPS_BACK + 1] * n
     for start_node in scc_candidates:
-        if time.perf_counter() - start_time > MAX_TIME_S:
-            break
-        if len(cycles) >= MAX_CYCLES:
+        if remaining[0] <= 0 or time.perf_counter() > deadline:
             break
-        visited: set[str] = set()
-        path: list[str] = []
-        _dfs(start_node, start_node, 0, visited, path, adjacency, cycles, seen, scc_nodes, MAX_CYCLES)
+        reached = _hops_to_start(start_node, rev_indptr, rev_neighbors, scc_of, dist,
+                                 MAX_HOPS_BACK)
+        _dfs(start_node, indptr, neighbors, dist, visited, path, cycles, seen, remaining, deadline)
+        for v in reached:
+            dist[v] = MAX_HOPS_BACK + 1
+        # Every cycle through start_node has now been enumerated, so later
+        # starts skip it. Each cycle is therefore only ever found from its
+        # first start, which lets _dfs key seen on the path as found
+        scc_of[start_node] = 0
 
     return cycles
 
 
-def _dfs(current, start, depth, visited, path, adjacency, cycles, seen, valid_nodes, max_cycles):
-    if depth > 5 or len(cycles) >= max_cycles:
-        return
-    visited.add(current)
-    path.append(current)
+def _hops_to_start(start, rev_indptr, rev_neighbors, scc_of, dist, max_hops) -> list[int]:
+    """Bounded reverse BFS: dist[v] = edges from v back to start, up to max_hops.
 
-    for edge in adjacency.get(current, []):
-        nxt = edge["receiver"]
-        if nxt not in valid_nodes:
-            continue
-        if nxt == start and depth >= 2:
-            cycle_len = len(path)
-            if 3 <= cycle_len <= 5:
-                cycle_path = list(path)
-                norm = _normalize_cycle(cycle_path)
-                key = "->".join(norm)
-                if key not in seen:
-                    seen.add(key)
-                    cycles.append(cycle_path)
-        elif nxt not in visited and depth < 4:
-            _dfs(nxt, start, depth + 1, visited, path, adjacency, cycles, seen, valid_nodes, max_cycles)
-
-    path.pop()
-    visited.discard(current)
-
-
-def _normalize_cycle(cycle: list[str]) -> list[str]:
-    min_idx = 0
-    for i in range(1, len(cycle)):
-        if cycle[i] < cycle[min_idx]:
-            min_idx = i
-    return cycle[min_idx:] + cycle[:min_idx]
+    Only nodes in start's component are labelled; everything else keeps
+    max_hops + 1. Returns the labelled nodes so the caller can reset them.
+    """
+    label = scc_of[start]
+    dist[start] = 0
+    reached = [start]
+    frontier = [start]
+    for hops in range(1, max_hops + 1):
+        next_frontier = []
+        for v in frontier:
+            for u in rev_neighbors[rev_indptr[v]:rev_indptr[v + 1]]:
+                if dist[u] > hops and scc_of[u] == label:
+                    dist[u] = hops
+                    next_frontier.append(u)
+        if not next_frontier:
+            break
+        reached += next_frontier
+        frontier = next_frontier
+    return reached
+
+
+def _dfs(start, indptr, neighbors, dist, visited, path, cycles, seen, remaining, deadline):
+    """Enumerate cycles of length 3-5 through start, without recursion.
+
+    path holds the current node at each depth (0-3); edge_pos/edge_end hold
+    the next unexplored CSR edge and the end of the slice for that depth.
+    dist comes from _hops_to_start: a step to a node at depth d+1 is only
+    taken if start is at most 4 - d edges away from it, so every branch
+    that is walked can still close a cycle (nodes outside start's component
+    never qualify). At depth 3 that test alone means nxt has an edge back to
+    start, so the length-5 cycle is recorded without pushing a frame.
+    visited is a 0/1 byte mask indexed by node id, shared across starts and
+    always left all-zero on return.
+    remaining is a one-element list holding the cycle budget left; the search
+    returns as soon as it reaches 0, or once the deadline has passed (polled
+    every TIME_POLL_STEPS steps rather than per edge).
+    Every path here begins at start and start is retired once its search
+    completes, so the path as found is already a canonical dedup key; seen
+    only catches repeats via parallel edges.
+    """
+    TIME_POLL_STEPS = 4096
+    until_poll = TIME_POLL_STEPS
+    edge_pos = [0] * 5
+    edge_end = [0] * 5
+    path[0] = start
+    visited[start] = 1
+    edge_pos[0] = indptr[start]
+    edge_end[0] = indptr[start + 1]
+    depth = 0
+
+    try:
+        while depth >= 0:
+            j = edge_pos[depth]
+            if j == edge_end[depth]:
+                # Slice exhausted — backtrack
+                visited[path[depth]] = 0
+                depth -= 1
+                continue
+            edge_pos[depth] = j + 1
+
+            nxt = neighbors[j]
+            if nxt == start:
+                if depth < 2:
+                    continue
+                cycle_path = path[:depth + 1]
+            elif dist[nxt] > 4 - depth or visited[nxt]:
+                continue
+            else:
+                until_poll -= 1
+                if not until_poll:
+                    if time.perf_counter() > deadline:
+                        return
+                    until_poll = TIME_POLL_STEPS
+                if depth < 3:
+                    depth += 1
+                    path[depth] = nxt
+                    visited[nxt] = 1
+                    edge_pos[depth] = indptr[nxt]
+                    edge_end[depth] = indptr[nxt + 1]
+                    continue
+                cycle_path = path[:4]
+                cycle_path.append(nxt)
+
+            key = tuple(cycle_path)
+            if key not in seen:
+                seen.add(key)
+                cycles.append(cycle_path)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    return
+    finally:
+        # Leave visited all-zero for the next start, even on an early return
+        for d in range(depth + 1):
+            visited[path[d]] = 0
 
 
 # ==============================================
@@ -238,113 +437,140 @@ def _normalize_cycle(cycle: list[str]) -> list[str]:
 # Uses pre-computed epochs
 # ==============================================
 
-def detect_smurfing(adjacency: dict, reverse_adj: dict, node_stats: dict) -> list[dict]:
+def detect_smurfing(graph: dict) -> list[dict]:
     FANIN_THRESHOLD = 10
     FANOUT_THRESHOLD = 10
     TEMPORAL_WINDOW_S = 72 * 3600  # 72 hours
 
+    indptr, neighbors = graph["indptr"], graph["neighbors"]
+    rev_indptr, rev_neighbors = graph["revIndptr"], graph["revNeighbors"]
+    out_timeline, in_timeline = graph["outTimeline"], graph["inTimeline"]
+    stats = graph["nodeStats"]
+    in_deg, out_deg = stats["inDeg"], stats["outDeg"]
+    # Slice sums are precomputed per node by build_graph
+    total_in, total_out = stats["totalIn"], stats["totalOut"]
     patterns = []
 
-    for account_id, stats in node_stats.items():
+    hubs = [
+        v for v, (d_in, d_out) in enumerate(zip(in_deg, out_deg))
+        if d_in >= FANIN_THRESHOLD or d_out >= FANOUT_THRESHOLD
+    ]
+    for v in hubs:
         # Fan-in
-        if stats["inDeg"] >= FANIN_THRESHOLD:
-            incoming = reverse_adj.get(account_id, [])
-            temporal_score = _compute_temporal_density(
-                [t["epoch"] for t in incoming], TEMPORAL_WINDOW_S
-            )
-            if temporal_score > 0:
-                unique_senders = set(t["sender"] for t in incoming)
-                if len(unique_senders) >= FANIN_THRESHOLD:
+        if in_deg[v] >= FANIN_THRESHOLD:
+            lo, hi = rev_indptr[v], rev_indptr[v + 1]
+            unique_senders = set(rev_neighbors[lo:hi])
+            if len(unique_senders) >= FANIN_THRESHOLD:
+                temporal_score = _compute_temporal_density(
+                    in_timeline[lo:hi], TEMPORAL_WINDOW_S
+                )
+                if temporal_score > 0:
                     patterns.append({
                         "type": "fan_in",
-                        "centerAccount": account_id,
+                        "centerAccount": v,
                         "connectedAccounts": list(unique_senders),
                         "temporalScore": temporal_score,
-                        "totalAmount": sum(t["amount"] for t in incoming),
-                        "txCount": len(incoming),
+                        "totalAmount": total_in[v],
+                        "txCount": hi - lo,
                     })
 
         # Fan-out
-        if stats["outDeg"] >= FANOUT_THRESHOLD:
-            outgoing = adjacency.get(account_id, [])
-            temporal_score = _compute_temporal_density(
-                [t["epoch"] for t in outgoing], TEMPORAL_WINDOW_S
-            )
-            if temporal_score > 0:
-                unique_receivers = set(t["receiver"] for t in outgoing)
-                if len(unique_receivers) >= FANOUT_THRESHOLD:
+        if out_deg[v] >= FANOUT_THRESHOLD:
+            lo, hi = indptr[v], indptr[v + 1]
+            unique_receivers = set(neighbors[lo:hi])
+            if len(unique_receivers) >= FANOUT_THRESHOLD:
+                temporal_score = _compute_temporal_density(
+                    out_timeline[lo:hi], TEMPORAL_WINDOW_S
+                )
+                if temporal_score > 0:
                     patterns.append({
                         "type": "fan_out",
-                        "centerAccount": account_id,
+                        "centerAccount": v,
                         "connectedAccounts": list(unique_receivers),
                         "temporalScore": temporal_score,
-                        "totalAmount": sum(t["amount"] for t in outgoing),
-                        "txCount": len(outgoing),
+                        "totalAmount": total_out[v],
+                        "txCount": hi - lo,
                     })
 
     return patterns
 
 
-def _compute_temporal_density(epoch_vals_unsorted: list[float], window_s: float) -> float:
-    """Sliding window density on pre-computed epoch values."""
-    if len(epoch_vals_unsorted) < 2:
+def _compute_temporal_density(epoch_vals: Sequence[float], window_s: float) -> float:
+    """Sliding window density on pre-computed epoch values.
+
+    epoch_vals must already be sorted ascending (build_graph sorts each
+    node's epoch slice), so a single two-pointer pass is enough — and when
+    the whole timeline fits in one window the answer is 1.0 without it.
+    """
+    count = len(epoch_vals)
+    if count < 2:
         return 0.0
-    epoch_vals = sorted(epoch_vals_unsorted)
+    if epoch_vals[-1] - epoch_vals[0] <= window_s:
+        return 1.0
     max_in_window = 0
     win_start = 0
-    for i in range(len(epoch_vals)):
-        while epoch_vals[i] - epoch_vals[win_start] > window_s:
+    for i, epoch in enumerate(epoch_vals):
+        while epoch - epoch_vals[win_start] > window_s:
             win_start += 1
-        max_in_window = max(max_in_window, i - win_start + 1)
-    return max_in_window / len(epoch_vals)
+        if i - win_start >= max_in_window:
+            max_in_window = i - win_start + 1
+    return max_in_window / count
 
 
 # ==============================================
 # PATTERN 3: LAYERED SHELL NETWORKS
 # ==============================================
 
-def detect_shell_networks(adjacency: dict, node_stats: dict) -> list[dict]:
+def detect_shell_networks(graph: dict) -> list[dict]:
     SHELL_TX_MIN = 2
     SHELL_TX_MAX = 3
     MIN_CHAIN_LENGTH = 3
     MAX_CHAINS = 100
 
-    potential_shells: set[str] = set()
-    for account_id, stats in node_stats.items():
-        if (SHELL_TX_MIN <= stats["txCount"] <= SHELL_TX_MAX
-                and stats["inDeg"] > 0 and stats["outDeg"] > 0):
-            potential_shells.add(account_id)
+    indptr, neighbors = graph["indptr"], graph["neighbors"]
+
+    # 0/1 shell flag per node id
+    stats = graph["nodeStats"]
+    is_shell = bytes(
+        SHELL_TX_MIN <= tx_count <= SHELL_TX_MAX and d_in > 0 and d_out > 0
+        for tx_count, d_in, d_out in zip(stats["txCount"], stats["inDeg"], stats["outDeg"])
+    )
+
+    # A walk only reaches MIN_CHAIN_LENGTH hops if its first step lands on a
+    # shell, so the starts are the non-shell senders into some shell. Sorted
+    # to keep the node-order scan of the full loop.
+    rev_indptr, rev_neighbors = graph["revIndptr"], graph["revNeighbors"]
+    starts = sorted({
+        u for s in range(len(is_shell)) if is_shell[s]
+        for u in rev_neighbors[rev_indptr[s]:rev_indptr[s + 1]]
+        if not is_shell[u]
+    })
 
     shell_chains: list[dict] = []
-    visited: set[str] = set()
 
-    for start_node in node_stats:
+    for start_node in starts:
         if len(shell_chains) >= MAX_CHAINS:
             break
-        if start_node in potential_shells:
-            continue
-        if start_node in visited:
-            continue
 
         chain = [start_node]
         current = start_node
         chain_visited = {start_node}
 
         while True:
-            out_edges = adjacency.get(current, [])
+            out_nodes = neighbors[indptr[current]:indptr[current + 1]]
             found_shell = False
-            for edge in out_edges:
-                if edge["receiver"] in potential_shells and edge["receiver"] not in chain_visited:
-                    chain.append(edge["receiver"])
-                    chain_visited.add(edge["receiver"])
-                    current = edge["receiver"]
+            for w in out_nodes:
+                if is_shell[w] and w not in chain_visited:
+                    chain.append(w)
+                    chain_visited.add(w)
+                    current = w
                     found_shell = True
                     break
 
             if not found_shell:
-                for edge in out_edges:
-                    if edge["receiver"] not in potential_shells and edge["receiver"] not in chain_visited:
-                        chain.append(edge["receiver"])
+                for w in out_nodes:
+                    if not is_shell[w] and w not in chain_visited:
+                        chain.append(w)
                         break
                 break
 
@@ -352,10 +578,10 @@ def detect_shell_networks(adjacency: dict, node_stats: dict) -> list[dict]:
                 break
 
         intermediaries = chain[1:-1]
-        shell_intermediaries = [a for a in intermediaries if a in potential_shells]
+        shell_intermediaries = [a for a in intermediaries if is_shell[a]]
         if len(chain) >= MIN_CHAIN_LENGTH + 1 and len(shell_intermediaries) >= 1:
             shell_chains.append({
-                "chain": list(chain),
+                "chain": chain,
                 "shellAccounts": shell_intermediaries,
                 "hopCount": len(chain) - 1,
             })
@@ -367,69 +593,84 @@ def detect_shell_networks(adjacency: dict, node_stats: dict) -> list[dict]:
 # FALSE POSITIVE FILTERING
 # ==============================================
 
-def identify_legitimate_accounts(node_stats: dict, adjacency: dict, reverse_adj: dict) -> set[str]:
-    legitimate: set[str] = set()
+def identify_legitimate_accounts(graph: dict) -> set[int]:
+    indptr, rev_indptr = graph["indptr"], graph["revIndptr"]
+    in_deg = graph["nodeStats"]["inDeg"]
+    out_deg = graph["nodeStats"]["outDeg"]
+    legitimate: set[int] = set()
 
-    for account_id, stats in node_stats.items():
+    candidates = [
+        v for v, (d_in, d_out) in enumerate(zip(in_deg, out_deg))
+        if (d_in >= 20 and d_out <= 3) or (d_out >= 20 and d_in <= 3)
+    ]
+    for v in candidates:
         # Merchant pattern
-        if stats["inDeg"] >= 20 and stats["outDeg"] <= 3:
-            amounts = [t["amount"] for t in reverse_adj.get(account_id, [])]
-            if amounts:
-                avg = sum(amounts) / len(amounts)
-                if avg > 0:
-                    var = sum((a - avg) ** 2 for a in amounts) / len(amounts)
-                    cv = math.sqrt(var) / avg
-                    if cv < 0.5:
-                        legitimate.add(account_id)
+        if in_deg[v] >= 20 and out_deg[v] <= 3:
+            cv = _amount_cv(graph["revAmounts"][rev_indptr[v]:rev_indptr[v + 1]])
+            if cv is not None and cv < 0.5:
+                legitimate.add(v)
 
         # Payroll pattern
-        if stats["outDeg"] >= 20 and stats["inDeg"] <= 3:
-            amounts = [t["amount"] for t in adjacency.get(account_id, [])]
-            if amounts:
-                avg = sum(amounts) / len(amounts)
-                if avg > 0:
-                    var = sum((a - avg) ** 2 for a in amounts) / len(amounts)
-                    cv = math.sqrt(var) / avg
-                    if cv < 0.3:
-                        legitimate.add(account_id)
+        if out_deg[v] >= 20 and in_deg[v] <= 3:
+            cv = _amount_cv(graph["amounts"][indptr[v]:indptr[v + 1]])
+            if cv is not None and cv < 0.3:
+                legitimate.add(v)
 
     return legitimate
 
 
+def _amount_cv(amounts: Sequence[float]) -> float | None:
+    """Coefficient of variation (population std / mean), None if mean <= 0."""
+    if not amounts:
+        return None
+    avg = sum(amounts) / len(amounts)
+    if avg <= 0:
+        return None
+    var = sum((a - avg) ** 2 for a in amounts) / len(amounts)
+    return math.sqrt(var) / avg
+
+
 # ==============================================
 # SUSPICION SCORING
 # ==============================================
 
 def calculate_suspicion_scores(
-    node_stats: dict,
-    cycles: list[list[str]],
+    graph: dict,
+    cycles: list[list[int]],
     smurfing_patterns: list[dict],
     shell_chains: list[dict],
-    legitimate_accounts: set[str],
+    legitimate_accounts: set[int],
 ) -> dict:
-    scores: dict[str, float] = {}
-    patterns: dict[str, set] = {}
-    ring_membership: dict[str, str] = {}
+    """Accumulate per-account scores and patterns, and build the ring list.
 
-    for account_id in node_stats:
-        scores[account_id] = 0
-        patterns[account_id] = set()
+    The detector results carry node ids. Scores, patterns and ring
+    membership are kept in lists indexed by node id while accumulating; the
+    string-keyed result dicts are built once at the end.
+    """
+    ids = graph["nodes"]
+    n = len(ids)
+    scores: list[float] = [0] * n
+    patterns: list[set] = [set() for _ in range(n)]
+    ring_of: list[str | None] = [None] * n
 
     ring_counter = 0
     cycle_rings: list[dict] = []
+    ring_members: list[list[int]] = []
 
     # 1. Cycle scoring
     for cycle in cycles:
         ring_counter += 1
         ring_id = f"RING_{ring_counter:03d}"
-        for account in cycle:
-            scores[account] += 30
-            patterns[account].add(f"cycle_length_{len(cycle)}")
-            if account not in ring_membership:
-                ring_membership[account] = ring_id
+        tag = f"cycle_length_{len(cycle)}"
+        for v in cycle:
+            scores[v] += 30
+            patterns[v].add(tag)
+            if ring_of[v] is None:
+                ring_of[v] = ring_id
+        ring_members.append(cycle)
         cycle_rings.append({
             "ring_id": ring_id,
-            "member_accounts": list(cycle),
+            "member_accounts": [ids[v] for v in cycle],
             "pattern_type": "cycle",
             "cycle_length": len(cycle),
             "risk_score": 0,
@@ -440,25 +681,25 @@ def calculate_suspicion_scores(
         ring_counter += 1
         ring_id = f"RING_{ring_counter:03d}"
 
-        scores[pat["centerAccount"]] += 25
-        patterns[pat["centerAccount"]].add(pat["type"])
-        patterns[pat["centerAccount"]].add("high_velocity")
-        if pat["centerAccount"] not in ring_membership:
-            ring_membership[pat["centerAccount"]] = ring_id
-
-        ring_members = [pat["centerAccount"]]
-        for connected in pat["connectedAccounts"]:
-            scores.setdefault(connected, 0)
-            scores[connected] += 15
-            patterns.setdefault(connected, set())
-            patterns[connected].add(f"smurfing_{pat['type']}")
-            if connected not in ring_membership:
-                ring_membership[connected] = ring_id
-            ring_members.append(connected)
-
+        center = pat["centerAccount"]
+        scores[center] += 25
+        patterns[center].add(pat["type"])
+        patterns[center].add("high_velocity")
+        if ring_of[center] is None:
+            ring_of[center] = ring_id
+
+        tag = f"smurfing_{pat['type']}"
+        for v in pat["connectedAccounts"]:
+            scores[v] += 15
+            patterns[v].add(tag)
+            if ring_of[v] is None:
+                ring_of[v] = ring_id
+
+        members = [center, *pat["connectedAccounts"]]
+        ring_members.append(members)
         cycle_rings.append({
             "ring_id": ring_id,
-            "member_accounts": ring_members,
+            "member_accounts": [ids[v] for v in members],
             "pattern_type": pat["type"],
             "risk_score": 0,
             "temporal_score": pat["temporalScore"],
@@ -468,69 +709,83 @@ def calculate_suspicion_scores(
     for shell in shell_chains:
         ring_counter += 1
         ring_id = f"RING_{ring_counter:03d}"
-        for account in shell["chain"]:
-            scores.setdefault(account, 0)
-            scores[account] += 20
-            patterns.setdefault(account, set())
-            patterns[account].add("shell_network")
-            if account in shell["shellAccounts"]:
-                patterns[account].add("shell_intermediary")
-            if account not in ring_membership:
-                ring_membership[account] = ring_id
+        for v in shell["chain"]:
+            scores[v] += 20
+            patterns[v].add("shell_network")
+            if ring_of[v] is None:
+                ring_of[v] = ring_id
+        for v in shell["shellAccounts"]:
+            patterns[v].add("shell_intermediary")
+        ring_members.append(shell["chain"])
         cycle_rings.append({
             "ring_id": ring_id,
-            "member_accounts": list(shell["chain"]),
+            "member_accounts": [ids[v] for v in shell["chain"]],
             "pattern_type": "shell_network",
             "risk_score": 0,
             "hop_count": shell["hopCount"],
         })
 
-    # 4. Additional scoring — uses pre-computed epochs
-    for account_id, stats in node_stats.items():
-        # High velocity
-        epochs = stats["epochs"]
-        if len(epochs) >= 5:
-            sorted_epochs = sorted(epochs)
-            time_span = sorted_epochs[-1] - sorted_epochs[0]
-            avg_interval = time_span / (len(sorted_epochs) - 1)
-            if 0 < avg_interval < 3600:
-                scores[account_id] += 10
-                patterns[account_id].add("high_velocity")
-
-        # Degree anomaly
-        if stats["inDeg"] > 0 and stats["outDeg"] > 0:
-            ratio = max(stats["inDeg"], stats["outDeg"]) / min(stats["inDeg"], stats["outDeg"])
-            if ratio > 5:
-                scores[account_id] += 10
-                patterns[account_id].add("degree_anomaly")
-
-        # Pass-through
-        if stats["totalIn"] > 0 and stats["totalOut"] > 0:
-            pass_through = min(stats["totalIn"], stats["totalOut"]) / max(stats["totalIn"], stats["totalOut"])
-            if pass_through > 0.85 and stats["txCount"] >= 4:
-                scores[account_id] += 5
-                patterns[account_id].add("pass_through")
+    # 4. Additional scoring — one node-id mask per criterion
+    stats = graph["nodeStats"]
+    in_deg, out_deg, tx_count = stats["inDeg"], stats["outDeg"], stats["txCount"]
+    indptr, rev_indptr = graph["indptr"], graph["revIndptr"]
+    out_timeline, in_timeline = graph["outTimeline"], graph["inTimeline"]
+
+    # High velocity: epoch slices are sorted, so their ends bound the span
+    high_velocity = []
+    for v in [v for v, count in enumerate(tx_count) if count >= 5]:
+        lo, hi = indptr[v], indptr[v + 1]
+        rev_lo, rev_hi = rev_indptr[v], rev_indptr[v + 1]
+        if rev_lo == rev_hi:
+            first, last = out_timeline[lo], out_timeline[hi - 1]
+        elif lo == hi:
+            first, last = in_timeline[rev_lo], in_timeline[rev_hi - 1]
+        else:
+            first = min(out_timeline[lo], in_timeline[rev_lo])
+            last = max(out_timeline[hi - 1], in_timeline[rev_hi - 1])
+        avg_interval = (last - first) / (tx_count[v] - 1)
+        if 0 < avg_interval < 3600:
+            high_velocity.append(v)
+
+    degree_anomaly = [
+        v for v, (d_in, d_out) in enumerate(zip(in_deg, out_deg))
+        if d_in > 0 and d_out > 0 and max(d_in, d_out) / min(d_in, d_out) > 5
+    ]
+
+    pass_through = [
+        v for v, (t_in, t_out, count)
+        in enumerate(zip(stats["totalIn"], stats["totalOut"], tx_count))
+        if t_in > 0 and t_out > 0 and count >= 4 and min(t_in, t_out) / max(t_in, t_out) > 0.85
+    ]
+
+    for mask, points, tag in (
+        (high_velocity, 10, "high_velocity"),
+        (degree_anomaly, 10, "degree_anomaly"),
+        (pass_through, 5, "pass_through"),
+    ):
+        for v in mask:
+            scores[v] += points
+            patterns[v].add(tag)
 
     # 5. Legitimate discount
-    for account_id in legitimate_accounts:
-        if account_id in scores:
-            scores[account_id] = round(scores[account_id] * 0.5)
-            patterns[account_id].add("likely_legitimate")
+    for v in legitimate_accounts:
+        scores[v] = round(scores[v] * 0.5)
+        patterns[v].add("likely_legitimate")
 
-    # Cap at 100
-    for account_id in scores:
-        scores[account_id] = min(100, round(scores[account_id] * 10) / 10)
+    # Cap at 100 and round to one decimal. Most accounts score 0, which
+    # would round to 0.0 anyway, so only the scored ones go through round()
+    scores = [min(100, round(score * 10) / 10) if score else 0.0 for score in scores]
 
     # Ring risk scores
-    for ring in cycle_rings:
-        member_scores = [scores.get(a, 0) for a in ring["member_accounts"]]
+    for ring, members in zip(cycle_rings, ring_members):
+        member_scores = [scores[v] for v in members]
         if member_scores:
             ring["risk_score"] = round(sum(member_scores) / len(member_scores) * 10) / 10
 
     return {
-        "scores": scores,
-        "patterns": {k: list(v) for k, v in patterns.items()},
-        "ringMembership": ring_membership,
+        "scores": dict(zip(ids, scores)),
+        "patterns": {account_id: list(p) for account_id, p in zip(ids, patterns)},
+        "ringMembership": {ids[v]: ring_id for v, ring_id in enumerate(ring_of) if ring_id is not None},
         "rings": cycle_rings,
     }
 
@@ -539,7 +794,7 @@ def calculate_suspicion_scores(
 # MAIN ANALYSIS PIPELINE
 # ==============================================
 
-def analyze_transactions(transactions: list[dict]) -> dict:
+def analyze_transactions(transactions: tuple[tuple[str, ...], ...]) -> dict:
     """Run the complete analysis pipeline."""
     start_time = time.perf_counter()
 
@@ -547,42 +802,41 @@ def analyze_transactions(transactions: list[dict]) -> dict:
     graph = build_graph(transactions)
 
     # Step 2: Detect cycles
-    cycles = detect_cycles(graph["adjacency"], graph["nodes"], graph["nodeStats"])
+    cycles = detect_cycles(graph)
 
     # Step 3: Detect smurfing
-    smurfing_patterns = detect_smurfing(graph["adjacency"], graph["reverseAdj"], graph["nodeStats"])
+    smurfing_patterns = detect_smurfing(graph)
 
     # Step 4: Detect shell networks
-    shell_chains = detect_shell_networks(graph["adjacency"], graph["nodeStats"])
+    shell_chains = detect_shell_networks(graph)
 
     # Step 5: False positive filtering
-    legitimate_accounts = identify_legitimate_accounts(
-        graph["nodeStats"], graph["adjacency"], graph["reverseAdj"]
-    )
+    legitimate_accounts = identify_legitimate_accounts(graph)
 
     # Step 6: Calculate scores
     result = calculate_suspicion_scores(
-        graph["nodeStats"], cycles, smurfing_patterns, shell_chains, legitimate_accounts
+        graph, cycles, smurfing_patterns, shell_chains, legitimate_accounts
     )
 
     end_time = time.perf_counter()
     processing_time = round((end_time - start_time) * 100) / 100
 
-    # Build suspicious accounts array
-    suspicious_accounts = sorted(
-        [
-            {
-                "account_id": acc_id,
-                "suspicion_score": score,
-                "detected_patterns": result["patterns"].get(acc_id, []),
-                "ring_id": result["ringMembership"].get(acc_id),
-            }
-            for acc_id, score in result["scores"].items()
-            if score > 0
-        ],
-        key=lambda x: x["suspicion_score"],
+    # Build suspicious accounts array (sorted by score desc)
+    flagged = sorted(
+        [item for item in result["scores"].items() if item[1] > 0],
+        key=itemgetter(1),
         reverse=True,
     )
+    account_patterns, ring_membership = result["patterns"], result["ringMembership"]
+    suspicious_accounts = [
+        {
+            "account_id": acc_id,
+            "suspicion_score": score,
+            "detected_patterns": account_patterns.get(acc_id, []),
+            "ring_id": ring_membership.get(acc_id),
+        }
+        for acc_id, score in flagged
+    ]
 
     fraud_rings = sorted(result["rings"], key=lambda x: x["risk_score"], reverse=True)
 
@@ -597,7 +851,7 @@ def analyze_transactions(transactions: list[dict]) -> dict:
         "fraud_rings": fraud_rings,
         "summary": {
             "total_accounts_analyzed": len(graph["nodes"]),
-            "total_transactions": len(transactions),
+            "total_transactions": len(transactions[0]) if transactions else 0,
             "suspicious_accounts_flagged": len(suspicious_accounts),
             "fraud_rings_detected": len(fraud_rings),
             "processing_time_seconds": processing_time,
@@ -616,14 +870,27 @@ def _build_graph_data_for_frontend(
     - Max 300 nodes with priority: ring > suspicious > high-degree > neighbors
     - Max 2000 edges
     """
+    all_nodes = graph["nodes"]
+    node_index = graph["nodeIndex"]
+    node_stats = graph["nodeStats"]
+    indptr, neighbors = graph["indptr"], graph["neighbors"]
+    rev_indptr, rev_neighbors = graph["revIndptr"], graph["revNeighbors"]
+    total_count = len(all_nodes)
+
     suspicious_set = set(a["account_id"] for a in suspicious_accounts)
     ring_member_set = set()
     for ring in fraud_rings:
         for m in ring["member_accounts"]:
             ring_member_set.add(m)
 
-    all_nodes = graph["nodes"]
-    total_count = len(all_nodes)
+    # Per-node flags indexed by node id, for the per-node and per-edge tests
+    is_sus = bytearray(total_count)
+    for nid in suspicious_set:
+        is_sus[node_index[nid]] = 1
+    is_ring = bytearray(total_count)
+    for nid in ring_member_set:
+        is_ring[node_index[nid]] = 1
+    flagged = bytes(a | b for a, b in zip(is_sus, is_ring))
 
     # Thresholds
     MAX_NODES = 300
@@ -642,8 +909,8 @@ def _build_graph_data_for_frontend(
         if len(nodes_to_render) < MAX_NODES:
             remaining_slots = MAX_NODES - len(nodes_to_render)
             other_nodes = [
-                (nid, graph["nodeStats"][nid]["inDeg"] + graph["nodeStats"][nid]["outDeg"])
-                for nid in all_nodes
+                (nid, d_in + d_out)
+                for nid, d_in, d_out in zip(all_nodes, node_stats["inDeg"], node_stats["outDeg"])
                 if nid not in nodes_to_render
             ]
             other_nodes.sort(key=lambda x: x[1], reverse=True)
@@ -655,86 +922,112 @@ def _build_graph_data_for_frontend(
         for acc in high_risk:
             if len(nodes_to_render) >= MAX_NODES + 50:  # small buffer for context
                 break
-            aid = acc["account_id"]
-            for e in graph["adjacency"].get(aid, [])[:5]:  # cap neighbors
-                nodes_to_render.add(e["receiver"])
-            for e in graph["reverseAdj"].get(aid, [])[:5]:
-                nodes_to_render.add(e["sender"])
+            v = node_index[acc["account_id"]]
+            lo = indptr[v]
+            for w in neighbors[lo:min(lo + 5, indptr[v + 1])]:  # cap neighbors
+                nodes_to_render.add(all_nodes[w])
+            lo = rev_indptr[v]
+            for u in rev_neighbors[lo:min(lo + 5, rev_indptr[v + 1])]:
+                nodes_to_render.add(all_nodes[u])
     else:
         nodes_to_render = set(all_nodes)
 
+    # Node sizes in one pass over the rendered ids, then the records
+    log2 = math.log2
+    total_in_col, total_out_col = node_stats["totalIn"], node_stats["totalOut"]
+    render_ids = [node_index[nid] for nid in nodes_to_render]
+    size_vals = [
+        round(min(50, 20 + log2(total_in_col[v] + total_out_col[v] + 1) * 3), 1)
+        for v in render_ids
+    ]
+
     cy_nodes = []
-    for nid in nodes_to_render:
-        stats = graph["nodeStats"][nid]
+    for nid, v, size_val in zip(nodes_to_render, render_ids, size_vals):
         score = scores.get(nid, 0)
         node_type = "normal"
-        if nid in ring_member_set:
+        if is_ring[v]:
             node_type = "ring"
-        elif nid in suspicious_set:
+        elif is_sus[v]:
             node_type = "suspicious"
 
-        total_volume = (stats["totalIn"] or 0) + (stats["totalOut"] or 0)
-        size_val = min(50, 20 + math.log2(total_volume + 1) * 3)
-
+        total_in = total_in_col[v]
+        total_out = total_out_col[v]
         cy_nodes.append({
             "id": nid,
             "type": node_type,
             "score": score,
-            "inDeg": stats["inDeg"],
-            "outDeg": stats["outDeg"],
-            "totalIn": round(stats["totalIn"], 2),
-            "totalOut": round(stats["totalOut"], 2),
-            "txCount": stats["txCount"],
+            "inDeg": node_stats["inDeg"][v],
+            "outDeg": node_stats["outDeg"][v],
+            "totalIn": round(total_in, 2),
+            "totalOut": round(total_out, 2),
+            "txCount": node_stats["txCount"][v],
             "ringId": ring_membership.get(nid),
             "patterns": patterns.get(nid, []),
-            "sizeVal": round(size_val, 1),
+            "sizeVal": size_val,
         })
 
-    # Aggregate edges — only between rendered nodes
-    edge_map: dict[str, dict] = {}
-    for sender_id in graph["adjacency"]:
-        if sender_id not in nodes_to_render:
-            continue
-        for edge in graph["adjacency"][sender_id]:
-            if edge["receiver"] not in nodes_to_render:
+    # Aggregate edges — only between rendered nodes. Keys pack the
+    # (sender, receiver) node ids into one int; id strings are only built
+    # for the edges that are actually emitted.
+    rendered = bytearray(total_count)
+    for v in render_ids:
+        rendered[v] = 1
+
+    amounts = graph["amounts"]
+    edge_map: dict[int, list] = {}
+    # Rendered senders in first-as-sender order (the baseline adjacency
+    # order), which also fixes top-K tie-breaking
+    for v in filter(rendered.__getitem__, graph["senderOrder"]):
+        base = v << 32
+        lo, hi = indptr[v], indptr[v + 1]
+        for w, amount in zip(neighbors[lo:hi], amounts[lo:hi]):
+            if not rendered[w]:
                 continue
-            key = f"{sender_id}->{edge['receiver']}"
-            if key not in edge_map:
-                edge_map[key] = {"source": sender_id, "target": edge["receiver"], "totalAmount": 0, "txCount": 0}
-            edge_map[key]["totalAmount"] += edge["amount"]
-            edge_map[key]["txCount"] += 1
+            agg = edge_map.get(base | w)
+            if agg is None:
+                edge_map[base | w] = [amount, 1]
+            else:
+                agg[0] += amount
+                agg[1] += 1
 
     # If too many edges, prioritize suspicious ones
     cy_edges = []
     edge_items = list(edge_map.items())
 
     if len(edge_items) > MAX_EDGES:
-        # Sort: suspicious edges first, then by amount
-        def edge_priority(item):
-            key, e = item
-            is_sus = (e["source"] in suspicious_set or e["target"] in suspicious_set
-                      or e["source"] in ring_member_set or e["target"] in ring_member_set)
-            return (not is_sus, -e["totalAmount"])
-        edge_items.sort(key=edge_priority)
-        edge_items = edge_items[:MAX_EDGES]
-
-    for key, e in edge_items:
-        is_suspicious = (
-            (e["source"] in suspicious_set and e["target"] in suspicious_set)
-            or (e["source"] in ring_member_set and e["target"] in ring_member_set)
-        )
-        src_score = scores.get(e["source"], 0)
-        tgt_score = scores.get(e["target"], 0)
+        # Suspicious edges first, then by amount — top-K without a full sort.
+        # Split on the flag once so the heap key is just the total; the
+        # unflagged edges are only scanned if the flagged ones fall short.
+        def edge_total(item):
+            return item[1][0]
+
+        def touches_flagged(item):
+            key = item[0]
+            return flagged[key >> 32] or flagged[key & 0xFFFFFFFF]
+
+        top = heapq.nlargest(MAX_EDGES, filter(touches_flagged, edge_items), key=edge_total)
+        if len(top) < MAX_EDGES:
+            rest = filterfalse(touches_flagged, edge_items)
+            top += heapq.nlargest(MAX_EDGES - len(top), rest, key=edge_total)
+        edge_items = top
+
+    weights = [round(max(1, min(5, log2(total + 1) * 0.5)), 2) for _, (total, _) in edge_items]
+    for (key, (total, tx_count)), weight in zip(edge_items, weights):
+        v, w = key >> 32, key & 0xFFFFFFFF
+        source, target = all_nodes[v], all_nodes[w]
+        is_suspicious = bool((is_sus[v] and is_sus[w]) or (is_ring[v] and is_ring[w]))
+        src_score = scores.get(source, 0)
+        tgt_score = scores.get(target, 0)
         edge_suspicion = round(max(src_score, tgt_score), 1)
         cy_edges.append({
-            "id": key,
-            "source": e["source"],
-            "target": e["target"],
-            "totalAmount": round(e["totalAmount"], 2),
-            "txCount": e["txCount"],
+            "id": f"{source}->{target}",
+            "source": source,
+            "target": target,
+            "totalAmount": round(total, 2),
+            "txCount": tx_count,
             "suspicious": is_suspicious,
             "suspicionScore": edge_suspicion,
-            "weight": round(max(1, min(5, math.log2(e["totalAmount"] + 1) * 0.5)), 2),
+            "weight": weight,
         })
 
     return {
@@ -746,7 +1039,36 @@ def _build_graph_data_for_frontend(
     }
 
 
-def parse_csv_content(content: str) -> list[dict]:
-    """Parse CSV string into list of dicts."""
-    reader = csv.DictReader(io.StringIO(content))
-    return list(reader)
+def parse_csv_content(content: bytes | str) -> tuple[tuple[str, ...], ...]:
+    """Parse CSV content (raw upload bytes or text) into columns.
+
+    Returns one tuple per TX_COLUMNS entry, in that order, or () when there
+    are no data rows. Rows shorter than the header are padded with "" before
+    being transposed, so a ragged row reaches build_graph, which skips it
+    for its empty amount or timestamp, instead of aborting the parse.
+    Raises ValueError if there are data rows but a required column is
+    missing, or if bytes are not valid UTF-8.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    reader = csv.reader(io.StringIO(content))
+    header = next(reader, [])
+    col_idx = {name: i for i, name in enumerate(header)}
+    rows = filter(None, reader)  # skip blank lines
+    first = next(rows, None)
+    if first is None:
+        return ()
+
+    missing = [c for c in TX_COLUMNS if c not in col_idx]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    indices = [col_idx[c] for c in TX_COLUMNS]
+    width = max(indices) + 1
+    pick = itemgetter(*indices)
+    # Short rows get "" where DictReader would have filled None.
+    padded = (
+        row if len(row) >= width else row + [""] * (width - len(row))
+        for row in chain((first,), rows)
+    )
+    return tuple(zip(*map(pick, padded)))
@@ -9,7 +9,12 @@ from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from graph_engine import analyze_transactions, parse_csv_content
+try:
+    # Imported as backend.main (e.g. the Vercel entry point)
+    from .graph_engine import analyze_transactions, parse_csv_content
+except ImportError:
+    # Run directly from the backend directory (python main.py / uvicorn main:app)
+    from graph_engine import analyze_transactions, parse_csv_content
 
 # ── Logging setup ──
 logging.basicConfig(
@@ -60,23 +65,19 @@ async def analyze(file: UploadFile = File(...)):
         )
 
     content = await file.read()
-    csv_text = content.decode("utf-8")
 
-    transactions = parse_csv_content(csv_text)
-    if not transactions:
+    # Decodes and validates the required columns while parsing
+    try:
+        transactions = parse_csv_content(content)
+    except ValueError as e:
         return JSONResponse(
             status_code=400,
-            content={"error": "No valid transactions found in the CSV"},
+            content={"error": str(e)},
         )
-
-    # Validate columns
-    required = {"transaction_id", "sender_id", "receiver_id", "amount", "timestamp"}
-    headers = set(transactions[0].keys())
-    missing = required - headers
-    if missing:
+    if not transactions:
         return JSONResponse(
             status_code=400,
-            content={"error": f"Missing columns: {', '.join(missing)}"},
+            content={"error": "No valid transactions found in the CSV"},
         )
 
     result = analyze_transactions(transactions)